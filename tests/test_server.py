@@ -1,8 +1,9 @@
 """Tests for renfield-mcp-jellyfin MCP server."""
 
-import json
-from unittest.mock import AsyncMock, patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
 
+import orjson
 import pytest
 
 from renfield_mcp_jellyfin import server as jf
@@ -12,25 +13,128 @@ from renfield_mcp_jellyfin import server as jf
 # Fixtures
 # ---------------------------------------------------------------------------
 
+_TEST_CONFIG = {
+    "JELLYFIN_URL": "http://jellyfin.local:8096",
+    "JELLYFIN_API_KEY": "test-api-key",
+    "JELLYFIN_USER_ID": "test-user-id",
+    "_CONFIG_ERROR": None,
+    "_API_STREAM_PREFIX": "http://jellyfin.local:8096/Audio/",
+    "_API_STREAM_SUFFIX": "/stream?static=true&api_key=test-api-key",
+    "_IMAGE_PREFIX": "http://jellyfin.local:8096/Items/",
+    "_IMAGE_SUFFIX": "/Images/Primary?api_key=test-api-key",
+}
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _set_config():
+    """Configure the server once per module; tests override via monkeypatch."""
+    old = {name: getattr(jf, name) for name in _TEST_CONFIG}
+    for name, value in _TEST_CONFIG.items():
+        setattr(jf, name, value)
+    yield
+    for name, value in old.items():
+        setattr(jf, name, value)
+
+
 @pytest.fixture(autouse=True)
-def _set_config(monkeypatch):
-    """Ensure config env vars are set for every test."""
-    monkeypatch.setattr(jf, "JELLYFIN_URL", "http://jellyfin.local:8096")
-    monkeypatch.setattr(jf, "JELLYFIN_API_KEY", "test-api-key")
-    monkeypatch.setattr(jf, "JELLYFIN_USER_ID", "test-user-id")
+def _clear_cache(monkeypatch):
+    """Give every test an empty response cache."""
+    monkeypatch.setattr(jf, "_CACHE", {})
+
+
+# Shared no-op payloads; tools only read responses, so reuse is safe.
+_EMPTY_PAGE = {"TotalRecordCount": 0, "Items": []}
+_EMPTY_LIST = []
+
+
+def _api_stream(item_id: str) -> str:
+    """Expected api_stream URL for an item under the test config."""
+    return f"{_TEST_CONFIG['_API_STREAM_PREFIX']}{item_id}{_TEST_CONFIG['_API_STREAM_SUFFIX']}"
+
+
+# Larger payloads are built once per module; tools never mutate them.
+@pytest.fixture(scope="module")
+def song_ab_page():
+    return {
+        "TotalRecordCount": 2,
+        "Items": [
+            {"Id": "1", "Name": "Song A", "Artists": ["Artist X"], "Album": "Album Y", "ProductionYear": 2020, "RunTimeTicks": 2_400_000_000},
+            {"Id": "2", "Name": "Song B", "Artists": ["Artist Z"], "Album": "Album W", "ProductionYear": 2021, "RunTimeTicks": 1_800_000_000},
+        ],
+    }
+
+
+@pytest.fixture(scope="module")
+def album_tracks_page():
+    return {
+        "TotalRecordCount": 3,
+        "Items": [
+            {"Id": "t1", "Name": "Track 1", "IndexNumber": 1, "Artists": ["Queen"], "RunTimeTicks": 2_100_000_000},
+            {"Id": "t2", "Name": "Track 2", "IndexNumber": 2, "Artists": ["Queen"], "RunTimeTicks": 3_300_000_000},
+            {"Id": "t3", "Name": "Track 3", "IndexNumber": 3, "Artists": ["Queen"], "RunTimeTicks": 1_500_000_000},
+        ],
+    }
+
+
+@pytest.fixture(scope="module")
+def favorites_page():
+    return {
+        "TotalRecordCount": 1,
+        "Items": [
+            {"Id": "f1", "Name": "Fav Song", "Type": "Audio", "Artists": ["Fav Artist"], "Album": "Fav Album", "ProductionYear": 2020, "RunTimeTicks": 2_400_000_000},
+        ],
+    }
+
+
+@pytest.fixture(scope="module")
+def library_counts():
+    return {
+        "SongCount": 1234,
+        "AlbumCount": 89,
+        "ArtistCount": 45,
+        "MovieCount": 67,
+        "SeriesCount": 12,
+        "EpisodeCount": 234,
+    }
 
 
 def _mock_response(data: dict | list) -> AsyncMock:
-    """Create a mock httpx response with .json() and .raise_for_status()."""
+    """Create a mock httpx response with .content and .raise_for_status()."""
     resp = MagicMock()
-    resp.json.return_value = data
+    resp.content = orjson.dumps(data)
     resp.raise_for_status.return_value = None
     return resp
 
 
-def _patch_get(return_data: dict | list):
-    """Patch _jellyfin_get to return given data."""
-    return patch.object(jf, "_jellyfin_get", new_callable=AsyncMock, return_value=return_data)
+class _Recorder:
+    """Cheap async stand-in for _jellyfin_get that records its calls."""
+
+    def __init__(self):
+        self.return_value = None
+        self.side_effect: BaseException | None = None
+        self.call_args_list: list[SimpleNamespace] = []
+
+    async def __call__(self, *args, **kwargs):
+        self.call_args_list.append(SimpleNamespace(args=args, kwargs=kwargs))
+        if self.side_effect is not None:
+            raise self.side_effect
+        return self.return_value
+
+    @property
+    def call_args(self) -> SimpleNamespace:
+        return self.call_args_list[-1]
+
+    @property
+    def call_count(self) -> int:
+        return len(self.call_args_list)
+
+
+@pytest.fixture
+def patched_get(monkeypatch):
+    """Replace _jellyfin_get with a _Recorder; tests set return_value or side_effect."""
+    recorder = _Recorder()
+    monkeypatch.setattr(jf, "_jellyfin_get", recorder)
+    return recorder
 
 
 # ---------------------------------------------------------------------------
@@ -41,35 +145,123 @@ class TestCheckConfig:
     def test_all_set(self):
         assert jf._check_config() is None
 
-    def test_missing_url(self, monkeypatch):
-        monkeypatch.setattr(jf, "JELLYFIN_URL", "")
+    @pytest.mark.parametrize("attr", ["JELLYFIN_URL", "JELLYFIN_API_KEY", "JELLYFIN_USER_ID"])
+    def test_missing(self, monkeypatch, attr):
+        monkeypatch.setattr(jf, attr, "")
         err = jf._check_config()
-        assert "JELLYFIN_URL" in err["error"]
-
-    def test_missing_api_key(self, monkeypatch):
-        monkeypatch.setattr(jf, "JELLYFIN_API_KEY", "")
-        err = jf._check_config()
-        assert "JELLYFIN_API_KEY" in err["error"]
-
-    def test_missing_user_id(self, monkeypatch):
-        monkeypatch.setattr(jf, "JELLYFIN_USER_ID", "")
-        err = jf._check_config()
-        assert "JELLYFIN_USER_ID" in err["error"]
+        assert attr in err["error"]
+
+
+class TestJellyfinGet:
+    async def test_parses_body(self, monkeypatch):
+        client = MagicMock()
+        client.get = AsyncMock(return_value=_mock_response({"Items": [{"Id": "x"}]}))
+        monkeypatch.setattr(jf, "_CLIENT", client)
+        data = await jf._jellyfin_get("/Items", Limit=5)
+        assert data == {"Items": [{"Id": "x"}]}
+        assert client.get.call_args.args[0] == "/Items"
+        assert client.get.call_args.kwargs["params"] == {"Limit": 5}
+
+    async def test_client_is_shared(self, monkeypatch):
+        monkeypatch.setattr(jf, "_CLIENT", None)
+        client = jf._get_client()
+        try:
+            assert jf._get_client() is client
+            assert str(client.base_url) == "http://jellyfin.local:8096"
+            assert client.headers["X-Emby-Token"] == "test-api-key"
+            assert "api_key" not in client.params
+        finally:
+            await jf._close_client()
+        assert jf._CLIENT is None
+        assert client.is_closed
+
+
+class TestCachedGet:
+    async def test_hit_within_ttl(self, patched_get):
+        patched_get.return_value = _EMPTY_PAGE
+        first, stale1 = await jf._cached_get("/Artists", 60, Limit=5)
+        second, stale2 = await jf._cached_get("/Artists", 60, Limit=5)
+        assert first is second
+        assert not stale1 and not stale2
+        assert patched_get.call_count == 1
+        assert patched_get.call_args.args == ("/Artists",)
+        assert patched_get.call_args.kwargs == {"Limit": 5}
+
+    async def test_params_are_part_of_key(self, patched_get):
+        patched_get.return_value = _EMPTY_PAGE
+        await jf._cached_get("/Artists", 60, Limit=5)
+        await jf._cached_get("/Artists", 60, Limit=10)
+        assert patched_get.call_count == 2
+
+    async def test_refetch_after_expiry(self, patched_get, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(jf.time, "monotonic", lambda: now[0])
+        patched_get.return_value = _EMPTY_PAGE
+        await jf._cached_get("/Artists", 60)
+        now[0] += 61
+        await jf._cached_get("/Artists", 60)
+        assert patched_get.call_count == 2
+
+    async def test_stale_fallback_on_error(self, patched_get, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(jf.time, "monotonic", lambda: now[0])
+        patched_get.return_value = {"SongCount": 1}
+        await jf.library_stats()
+        now[0] += 61
+        patched_get.side_effect = jf.httpx.ConnectError("down")
+        result = await jf.library_stats()
+        assert result["songs"] == 1
+        assert result["stale"] is True
+
+    async def test_error_without_entry_raises(self, patched_get):
+        patched_get.side_effect = jf.httpx.ConnectError("down")
+        with pytest.raises(jf.httpx.ConnectError):
+            await jf._cached_get("/Items/Counts", 60)
+
+    async def test_evicts_oldest(self, patched_get, monkeypatch):
+        monkeypatch.setattr(jf, "_CACHE_MAX_ENTRIES", 2)
+        patched_get.return_value = _EMPTY_PAGE
+        for limit in (1, 2, 3):
+            await jf._cached_get("/Artists", 60, Limit=limit)
+        assert [dict(params)["Limit"] for _, _, params in jf._CACHE] == [2, 3]
+
+    async def test_hit_survives_eviction(self, patched_get, monkeypatch):
+        monkeypatch.setattr(jf, "_CACHE_MAX_ENTRIES", 2)
+        patched_get.return_value = _EMPTY_PAGE
+        await jf._cached_get("/Artists", 60, Limit=1)
+        await jf._cached_get("/Artists", 60, Limit=2)
+        await jf._cached_get("/Artists", 60, Limit=1)  # hit: now most recent
+        await jf._cached_get("/Artists", 60, Limit=3)
+        assert [dict(params)["Limit"] for _, _, params in jf._CACHE] == [1, 3]
+        assert patched_get.call_count == 3
+
+    async def test_caches_shaped_result(self, patched_get):
+        patched_get.return_value = {"TotalRecordCount": 1, "Items": [{"Id": "a", "Overview": "long text"}]}
+        result, _ = await jf._cached_get("/Artists", 60, jf._page(jf._FMT_BRIEF))
+        assert result == {"total": 1, "items": [{"id": "a"}]}
+        assert [entry[1] for entry in jf._CACHE.values()] == [result]
+
+    async def test_stale_result_is_copied(self, patched_get, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(jf.time, "monotonic", lambda: now[0])
+        patched_get.return_value = {"SongCount": 1}
+        await jf.library_stats()
+        now[0] += 61
+        patched_get.side_effect = jf.httpx.ConnectError("down")
+        await jf.library_stats()
+        assert all("stale" not in entry[1] for entry in jf._CACHE.values())
 
 
 class TestFormatDuration:
-    def test_normal(self):
+    @pytest.mark.parametrize("ticks,expected", [
         # 5 minutes 30 seconds = 5*60+30 = 330 seconds = 330 * 10_000_000 ticks
-        assert jf._format_duration(3_300_000_000) == "5:30"
-
-    def test_zero_seconds(self):
-        assert jf._format_duration(1_800_000_000) == "3:00"
-
-    def test_none(self):
-        assert jf._format_duration(None) is None
-
-    def test_zero(self):
-        assert jf._format_duration(0) is None
+        pytest.param(3_300_000_000, "5:30", id="normal"),
+        pytest.param(1_800_000_000, "3:00", id="zero_seconds"),
+        pytest.param(None, None, id="none"),
+        pytest.param(0, None, id="zero"),
+    ])
+    def test_format(self, ticks, expected):
+        assert jf._format_duration(ticks) == expected
 
 
 class TestFormatItem:
@@ -115,200 +307,203 @@ class TestFormatItem:
         result = jf._format_item(raw, ["id", "stream_url", "container"])
         assert result == {"id": "x", "stream_url": "/music/song.flac", "container": "flac"}
 
+    def test_urls(self):
+        result = jf._format_item({"Id": "x"}, ["api_stream", "image_url"])
+        assert result == {
+            "api_stream": "http://jellyfin.local:8096/Audio/x/stream?static=true&api_key=test-api-key",
+            "image_url": "http://jellyfin.local:8096/Items/x/Images/Primary?api_key=test-api-key",
+        }
+
+    def test_urls_need_id(self):
+        assert jf._format_item({"Name": "x"}, ["api_stream", "image_url"]) == {}
+
+    def test_every_field_skips_missing_data(self):
+        fields = (*jf._FIELD_SOURCES, *jf._FIELD_BLOCKS)
+        assert jf._format_item({}, fields) == {}
+
+    def test_unknown_field_ignored(self):
+        assert jf._format_item({"Id": "x"}, ["id", "bogus"]) == {"id": "x"}
+
+    def test_formatter_cached_per_field_set(self):
+        assert jf._formatter(("id", "name")) is jf._formatter(("id", "name"))
+
 
 # ---------------------------------------------------------------------------
 # Tool tests — Music (9)
 # ---------------------------------------------------------------------------
 
 class TestSearchMedia:
-    async def test_audio_search(self):
-        with _patch_get({
-            "TotalRecordCount": 2,
-            "Items": [
-                {"Id": "1", "Name": "Song A", "Artists": ["Artist X"], "Album": "Album Y", "ProductionYear": 2020, "RunTimeTicks": 2_400_000_000},
-                {"Id": "2", "Name": "Song B", "Artists": ["Artist Z"], "Album": "Album W", "ProductionYear": 2021, "RunTimeTicks": 1_800_000_000},
-            ],
-        }) as mock:
-            result = await jf.search_media("test query")
-            assert result["total"] == 2
-            assert len(result["items"]) == 2
-            assert result["items"][0]["name"] == "Song A"
-            assert result["items"][0]["artist"] == "Artist X"
-            assert "api_stream" in result["items"][0]
-            assert "1" in result["items"][0]["api_stream"]
-            mock.assert_called_once()
-
-    async def test_album_search(self):
-        with _patch_get({
+    async def test_audio_search(self, patched_get, song_ab_page):
+        patched_get.return_value = song_ab_page
+        result = await jf.search_media("test query")
+        assert result["total"] == 2
+        assert len(result["items"]) == 2
+        assert result["items"][0]["name"] == "Song A"
+        assert result["items"][0]["artist"] == "Artist X"
+        assert result["items"][0]["api_stream"] == _api_stream("1")
+        assert patched_get.call_count == 1
+
+    async def test_album_search(self, patched_get):
+        patched_get.return_value = {
             "TotalRecordCount": 1,
             "Items": [
                 {"Id": "a1", "Name": "Dark Side", "AlbumArtist": "Pink Floyd", "ProductionYear": 1973, "Genres": ["Rock"]},
             ],
-        }):
-            result = await jf.search_media("dark side", type="MusicAlbum")
-            assert result["items"][0]["name"] == "Dark Side"
-
-    async def test_limit_clamped(self):
-        with _patch_get({"TotalRecordCount": 0, "Items": []}) as mock:
-            await jf.search_media("x", limit=200)
-            call_kwargs = mock.call_args
-            assert call_kwargs.kwargs["Limit"] == 50
+        }
+        result = await jf.search_media("dark side", type="MusicAlbum")
+        assert result["items"][0]["name"] == "Dark Side"
+
+    async def test_fields_follow_type(self, patched_get):
+        patched_get.return_value = _EMPTY_PAGE
+        await jf.search_media("x", type="Movie")
+        fields = patched_get.call_args.kwargs["Fields"].split(",")
+        assert "Overview" in fields
+        assert "RunTimeTicks" not in fields
+
+    async def test_limit_clamped(self, patched_get):
+        patched_get.return_value = _EMPTY_PAGE
+        await jf.search_media("x", limit=200)
+        call_kwargs = patched_get.call_args
+        assert call_kwargs.kwargs["Limit"] == 50
 
     async def test_missing_config(self, monkeypatch):
         monkeypatch.setattr(jf, "JELLYFIN_URL", "")
+        monkeypatch.setattr(jf, "_CONFIG_ERROR", jf._check_config())
         result = await jf.search_media("test")
         assert "error" in result
 
+    async def test_missing_config_skips_request(self, patched_get, monkeypatch):
+        monkeypatch.setattr(jf, "_CONFIG_ERROR", {"error": "JELLYFIN_URL not configured"})
+        patched_get.return_value = _EMPTY_PAGE
+        result = await jf.search_media("test")
+        assert result is jf._CONFIG_ERROR
+        assert patched_get.call_count == 0
+
 
 class TestListAlbums:
-    async def test_basic(self):
-        with _patch_get({
+    async def test_basic(self, patched_get):
+        patched_get.return_value = {
             "TotalRecordCount": 1,
             "Items": [
                 {"Id": "a1", "Name": "Album X", "AlbumArtist": "Artist Y", "ProductionYear": 2020, "Genres": ["Pop"]},
             ],
-        }):
-            result = await jf.list_albums()
-            assert result["total"] == 1
-            assert result["items"][0]["album_artist"] == "Artist Y"
-
-    async def test_with_artist_filter(self):
-        with _patch_get({"TotalRecordCount": 0, "Items": []}) as mock:
-            await jf.list_albums(artist="Queen")
-            assert mock.call_args.kwargs["Artists"] == "Queen"
-
-    async def test_with_genre_filter(self):
-        with _patch_get({"TotalRecordCount": 0, "Items": []}) as mock:
-            await jf.list_albums(genre="Rock")
-            assert mock.call_args.kwargs["Genres"] == "Rock"
-
-    async def test_sort_by_year(self):
-        with _patch_get({"TotalRecordCount": 0, "Items": []}) as mock:
-            await jf.list_albums(sort="year")
-            assert mock.call_args.kwargs["SortBy"] == "PremiereDate"
-            assert mock.call_args.kwargs["SortOrder"] == "Descending"
-
-    async def test_sort_by_name_ascending(self):
-        with _patch_get({"TotalRecordCount": 0, "Items": []}) as mock:
-            await jf.list_albums(sort="name")
-            assert mock.call_args.kwargs["SortBy"] == "SortName"
-            assert mock.call_args.kwargs["SortOrder"] == "Ascending"
+        }
+        result = await jf.list_albums()
+        assert result["total"] == 1
+        assert result["items"][0]["album_artist"] == "Artist Y"
 
 
 class TestListArtists:
-    async def test_basic(self):
-        with _patch_get({
+    async def test_basic(self, patched_get):
+        patched_get.return_value = {
             "TotalRecordCount": 2,
             "Items": [
                 {"Id": "ar1", "Name": "Queen", "Genres": ["Rock"]},
                 {"Id": "ar2", "Name": "Mozart", "Genres": ["Classical"]},
             ],
-        }):
-            result = await jf.list_artists()
-            assert result["total"] == 2
-            assert result["items"][1]["name"] == "Mozart"
+        }
+        result = await jf.list_artists()
+        assert result["total"] == 2
+        assert result["items"][1]["name"] == "Mozart"
 
-    async def test_limit_clamped(self):
-        with _patch_get({"TotalRecordCount": 0, "Items": []}) as mock:
-            await jf.list_artists(limit=500)
-            assert mock.call_args.kwargs["Limit"] == 200
+    async def test_limit_clamped(self, patched_get):
+        patched_get.return_value = _EMPTY_PAGE
+        await jf.list_artists(limit=500)
+        assert patched_get.call_args.kwargs["Limit"] == 200
 
 
 class TestGetAlbumTracks:
-    async def test_returns_tracks(self):
-        with _patch_get({
-            "TotalRecordCount": 3,
-            "Items": [
-                {"Id": "t1", "Name": "Track 1", "IndexNumber": 1, "Artists": ["Queen"], "RunTimeTicks": 2_100_000_000},
-                {"Id": "t2", "Name": "Track 2", "IndexNumber": 2, "Artists": ["Queen"], "RunTimeTicks": 3_300_000_000},
-                {"Id": "t3", "Name": "Track 3", "IndexNumber": 3, "Artists": ["Queen"], "RunTimeTicks": 1_500_000_000},
-            ],
-        }) as mock:
-            result = await jf.get_album_tracks("album-id-123")
-            assert result["total"] == 3
-            assert result["items"][0]["index"] == 1
-            assert result["items"][0]["duration"] == "3:30"
-            assert "api_stream" in result["items"][0]
-            assert "t1" in result["items"][0]["api_stream"]
-            assert mock.call_args.kwargs["ParentId"] == "album-id-123"
+    async def test_returns_tracks(self, patched_get, album_tracks_page):
+        patched_get.return_value = album_tracks_page
+        result = await jf.get_album_tracks("album-id-123")
+        assert result["total"] == 3
+        assert result["items"][0]["index"] == 1
+        assert result["items"][0]["duration"] == "3:30"
+        assert result["items"][0]["api_stream"] == _api_stream("t1")
+        assert patched_get.call_args.kwargs["ParentId"] == "album-id-123"
 
 
 class TestGetArtistAlbums:
-    async def test_returns_albums(self):
-        with _patch_get({
+    async def test_returns_albums(self, patched_get):
+        patched_get.return_value = {
             "TotalRecordCount": 2,
             "Items": [
                 {"Id": "a1", "Name": "Album A", "ProductionYear": 1980, "Genres": ["Rock"]},
                 {"Id": "a2", "Name": "Album B", "ProductionYear": 1975, "Genres": ["Rock"]},
             ],
-        }) as mock:
-            result = await jf.get_artist_albums("artist-id-456")
-            assert result["total"] == 2
-            assert mock.call_args.kwargs["ArtistIds"] == "artist-id-456"
+        }
+        result = await jf.get_artist_albums("artist-id-456")
+        assert result["total"] == 2
+        assert patched_get.call_args.kwargs["ArtistIds"] == "artist-id-456"
 
 
 class TestListGenres:
-    async def test_returns_genres(self):
-        with _patch_get({
+    async def test_returns_genres(self, patched_get):
+        patched_get.return_value = {
             "TotalRecordCount": 3,
             "Items": [
                 {"Id": "g1", "Name": "Rock"},
                 {"Id": "g2", "Name": "Jazz"},
                 {"Id": "g3", "Name": "Classical"},
             ],
-        }):
-            result = await jf.list_genres()
-            assert result["total"] == 3
-            names = [g["name"] for g in result["items"]]
-            assert "Rock" in names
-            assert "Jazz" in names
+        }
+        result = await jf.list_genres()
+        assert result["total"] == 3
+        names = [g["name"] for g in result["items"]]
+        assert "Rock" in names
+        assert "Jazz" in names
 
 
 class TestGetRecent:
-    async def test_returns_list(self):
+    async def test_returns_list(self, patched_get):
         """Latest endpoint returns a flat list, not {Items: [...]}."""
-        with _patch_get([
+        patched_get.return_value = [
             {"Id": "r1", "Name": "New Album", "AlbumArtist": "Band", "ProductionYear": 2025, "Genres": ["Pop"]},
             {"Id": "r2", "Name": "Another Album", "AlbumArtist": "Solo", "ProductionYear": 2024, "Genres": ["Rock"]},
-        ]):
-            result = await jf.get_recent()
-            assert result["total"] == 2
-            assert result["items"][0]["name"] == "New Album"
+        ]
+        result = await jf.get_recent()
+        assert result["total"] == 2
+        assert result["items"][0]["name"] == "New Album"
 
-    async def test_audio_type(self):
-        with _patch_get([
+    async def test_audio_type(self, patched_get):
+        patched_get.return_value = [
             {"Id": "s1", "Name": "Song", "Artists": ["X"], "Album": "Y", "ProductionYear": 2025},
-        ]):
-            result = await jf.get_recent(type="Audio")
-            assert result["items"][0]["name"] == "Song"
+        ]
+        result = await jf.get_recent(type="Audio")
+        assert result["items"][0]["name"] == "Song"
+
+    async def test_fields_follow_type(self, patched_get):
+        patched_get.return_value = _EMPTY_LIST
+        await jf.get_recent(type="Movie")
+        assert patched_get.call_args.kwargs["Fields"] == jf._FIELDS_VIDEO
+
+    async def test_empty(self, patched_get):
+        patched_get.return_value = _EMPTY_LIST
+        result = await jf.get_recent()
+        assert result == {"total": 0, "items": []}
 
 
 class TestGetFavorites:
-    async def test_returns_favorites(self):
-        with _patch_get({
-            "TotalRecordCount": 1,
-            "Items": [
-                {"Id": "f1", "Name": "Fav Song", "Type": "Audio", "Artists": ["Fav Artist"], "Album": "Fav Album", "ProductionYear": 2020, "RunTimeTicks": 2_400_000_000},
-            ],
-        }):
-            result = await jf.get_favorites()
-            assert result["total"] == 1
-            assert result["items"][0]["name"] == "Fav Song"
+    async def test_returns_favorites(self, patched_get, favorites_page):
+        patched_get.return_value = favorites_page
+        result = await jf.get_favorites()
+        assert result["total"] == 1
+        assert result["items"][0]["name"] == "Fav Song"
 
 
 class TestGetPlaylists:
-    async def test_returns_playlists(self):
-        with _patch_get({
+    async def test_returns_playlists(self, patched_get):
+        patched_get.return_value = {
             "TotalRecordCount": 2,
             "Items": [
                 {"Id": "p1", "Name": "Chill Mix", "ChildCount": 15},
                 {"Id": "p2", "Name": "Workout", "ChildCount": 30, "Overview": "Gym playlist"},
             ],
-        }):
-            result = await jf.get_playlists()
-            assert result["total"] == 2
-            assert result["items"][0]["child_count"] == 15
-            assert result["items"][1]["overview"] == "Gym playlist"
+        }
+        result = await jf.get_playlists()
+        assert result["total"] == 2
+        assert result["items"][0]["child_count"] == 15
+        assert result["items"][1]["overview"] == "Gym playlist"
 
 
 # ---------------------------------------------------------------------------
@@ -316,114 +511,178 @@ class TestGetPlaylists:
 # ---------------------------------------------------------------------------
 
 class TestListMovies:
-    async def test_basic(self):
-        with _patch_get({
+    async def test_basic(self, patched_get):
+        patched_get.return_value = {
             "TotalRecordCount": 1,
             "Items": [
                 {"Id": "m1", "Name": "The Matrix", "ProductionYear": 1999, "Genres": ["Sci-Fi"], "Overview": "A hacker discovers reality is a simulation."},
             ],
-        }):
-            result = await jf.list_movies()
-            assert result["total"] == 1
-            assert result["items"][0]["name"] == "The Matrix"
-            assert result["items"][0]["year"] == 1999
-
-    async def test_genre_filter(self):
-        with _patch_get({"TotalRecordCount": 0, "Items": []}) as mock:
-            await jf.list_movies(genre="Action")
-            assert mock.call_args.kwargs["Genres"] == "Action"
-
-    async def test_sort_by_rating(self):
-        with _patch_get({"TotalRecordCount": 0, "Items": []}) as mock:
-            await jf.list_movies(sort="rating")
-            assert mock.call_args.kwargs["SortBy"] == "CommunityRating"
+        }
+        result = await jf.list_movies()
+        assert result["total"] == 1
+        assert result["items"][0]["name"] == "The Matrix"
+        assert result["items"][0]["year"] == 1999
+        assert "overview" not in result["items"][0]
+
+    async def test_include_overview(self, patched_get):
+        patched_get.return_value = {
+            "TotalRecordCount": 1,
+            "Items": [{"Id": "m1", "Name": "The Matrix", "Overview": "A hacker discovers reality is a simulation."}],
+        }
+        result = await jf.list_movies(include_overview=True)
+        assert "Overview" in patched_get.call_args.kwargs["Fields"]
+        assert result["items"][0]["overview"].startswith("A hacker")
 
 
 class TestListSeries:
-    async def test_basic(self):
-        with _patch_get({
+    async def test_basic(self, patched_get):
+        patched_get.return_value = {
             "TotalRecordCount": 1,
             "Items": [
                 {"Id": "s1", "Name": "Breaking Bad", "ProductionYear": 2008, "Genres": ["Drama"], "Overview": "A chemistry teacher turns to crime."},
             ],
-        }):
-            result = await jf.list_series()
-            assert result["total"] == 1
-            assert result["items"][0]["name"] == "Breaking Bad"
+        }
+        result = await jf.list_series()
+        assert result["total"] == 1
+        assert result["items"][0]["name"] == "Breaking Bad"
 
-    async def test_genre_filter(self):
-        with _patch_get({"TotalRecordCount": 0, "Items": []}) as mock:
-            await jf.list_series(genre="Comedy")
-            assert mock.call_args.kwargs["Genres"] == "Comedy"
+
+# ---------------------------------------------------------------------------
+# Tool tests — query parameter passthrough
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize("fn,in_kw,out_kw", [
+    pytest.param(jf.list_albums, {"artist": "Queen"}, {"Artists": "Queen"}, id="albums-artist"),
+    pytest.param(jf.list_albums, {"genre": "Rock"}, {"Genres": "Rock"}, id="albums-genre"),
+    pytest.param(jf.list_albums, {"sort": "year"}, {"SortBy": "PremiereDate", "SortOrder": "Descending"}, id="albums-sort-year"),
+    pytest.param(jf.list_albums, {"sort": "name"}, {"SortBy": "SortName", "SortOrder": "Ascending"}, id="albums-sort-name"),
+    pytest.param(jf.list_albums, {"sort": "bogus"}, {"SortBy": "SortName", "SortOrder": "Ascending"}, id="albums-sort-unknown"),
+    pytest.param(jf.list_movies, {"genre": "Action"}, {"Genres": "Action"}, id="movies-genre"),
+    pytest.param(jf.list_movies, {"sort": "rating"}, {"SortBy": "CommunityRating"}, id="movies-sort-rating"),
+    pytest.param(jf.list_series, {"genre": "Comedy"}, {"Genres": "Comedy"}, id="series-genre"),
+])
+async def test_kwarg_passthrough(patched_get, fn, in_kw, out_kw):
+    patched_get.return_value = _EMPTY_PAGE
+    await fn(**in_kw)
+    for key, value in out_kw.items():
+        assert patched_get.call_args.kwargs[key] == value
 
 
 # ---------------------------------------------------------------------------
-# Tool tests — Utility (2)
+# Tool tests — Utility (4)
 # ---------------------------------------------------------------------------
 
+class TestSearchAll:
+    async def test_searches_each_type(self, patched_get):
+        patched_get.return_value = {
+            "TotalRecordCount": 1,
+            "Items": [{"Id": "x1", "Name": "Match", "ProductionYear": 2001}],
+        }
+        result = await jf.search_all("match", limit=5)
+        assert set(result) == {"songs", "albums", "movies", "series"}
+        assert result["movies"]["items"][0]["name"] == "Match"
+        types = sorted(c.kwargs["IncludeItemTypes"] for c in patched_get.call_args_list)
+        assert types == ["Audio", "Movie", "MusicAlbum", "Series"]
+        assert all(c.kwargs["Limit"] == 5 for c in patched_get.call_args_list)
+
+    async def test_missing_config(self, monkeypatch):
+        monkeypatch.setattr(jf, "_CONFIG_ERROR", {"error": "JELLYFIN_URL not configured"})
+        result = await jf.search_all("x")
+        assert "error" in result
+
+
 class TestGetStreamUrl:
-    async def test_returns_urls(self):
-        with _patch_get({
+    async def test_returns_urls(self, patched_get):
+        patched_get.return_value = {
             "Id": "item1",
             "Name": "Song X",
             "MediaSources": [{"Path": "/data/music/song.flac", "Container": "flac"}],
-        }):
-            result = await jf.get_stream_url("item1")
-            assert result["name"] == "Song X"
-            assert result["stream_url"] == "/data/music/song.flac"
-            assert result["container"] == "flac"
-            assert "api_stream" in result
-            assert "item1" in result["api_stream"]
+        }
+        result = await jf.get_stream_url("item1")
+        assert result["name"] == "Song X"
+        assert result["stream_url"] == "/data/music/song.flac"
+        assert result["container"] == "flac"
+        assert result["api_stream"] == _api_stream("item1")
+
+    async def test_cached_per_item(self, patched_get):
+        patched_get.return_value = {"Id": "item1", "MediaSources": [{"Path": "/a.flac"}]}
+        await jf.get_stream_url("item1")
+        await jf.get_stream_url("item1")
+        await jf.get_stream_url("item2")
+        assert patched_get.call_count == 2
+
+
+class TestClearCache:
+    async def test_clears_entries(self, patched_get):
+        patched_get.return_value = {"SongCount": 1}
+        await jf.library_stats()
+        assert await jf.clear_cache() == {"cleared": 1}
+        await jf.library_stats()
+        assert patched_get.call_count == 2
 
 
 class TestLibraryStats:
-    async def test_returns_counts(self):
-        with _patch_get({
-            "SongCount": 1234,
-            "AlbumCount": 89,
-            "ArtistCount": 45,
-            "MovieCount": 67,
-            "SeriesCount": 12,
-            "EpisodeCount": 234,
-        }):
-            result = await jf.library_stats()
-            assert result["songs"] == 1234
-            assert result["albums"] == 89
-            assert result["artists"] == 45
-            assert result["movies"] == 67
-            assert result["series"] == 12
-            assert result["episodes"] == 234
+    async def test_returns_counts(self, patched_get, library_counts):
+        patched_get.return_value = library_counts
+        result = await jf.library_stats()
+        assert result["songs"] == 1234
+        assert result["albums"] == 89
+        assert result["artists"] == 45
+        assert result["movies"] == 67
+        assert result["series"] == 12
+        assert result["episodes"] == 234
+
+
+# ---------------------------------------------------------------------------
+# MCP serialization
+# ---------------------------------------------------------------------------
+
+class TestCallTool:
+    async def test_dict_result_is_compact_json(self, patched_get):
+        patched_get.return_value = {"SongCount": 3}
+        content = await jf.mcp.call_tool("library_stats", {})
+        assert len(content) == 1
+        assert content[0].text == (
+            '{"songs":3,"albums":0,"artists":0,"movies":0,"series":0,"episodes":0}'
+        )
 
 
 # ---------------------------------------------------------------------------
 # Response size tests
 # ---------------------------------------------------------------------------
 
+# Representative payloads, sized with orjson — the serializer the server sends them with.
+_SEARCH20 = {
+    "total": 20,
+    "items": [
+        {
+            "id": f"id-{i:04d}",
+            "name": f"Song Title Number {i}",
+            "artist": f"Artist Name {i}",
+            "album": f"Album Name {i}",
+            "year": 2020 + (i % 5),
+            "duration": f"{3 + i % 4}:{(i * 7) % 60:02d}",
+        }
+        for i in range(20)
+    ],
+}
+_SEARCH20_SIZE = len(orjson.dumps(_SEARCH20))
+
+_STATS = {
+    "songs": 12345,
+    "albums": 890,
+    "artists": 456,
+    "movies": 678,
+    "series": 123,
+    "episodes": 2345,
+}
+_STATS_SIZE = len(orjson.dumps(_STATS))
+
+
 class TestResponseSize:
     def test_search_20_results_under_5kb(self):
         """20 compact search results must fit under 5KB."""
-        items = []
-        for i in range(20):
-            items.append({
-                "id": f"id-{i:04d}",
-                "name": f"Song Title Number {i}",
-                "artist": f"Artist Name {i}",
-                "album": f"Album Name {i}",
-                "year": 2020 + (i % 5),
-                "duration": f"{3 + i % 4}:{(i * 7) % 60:02d}",
-            })
-        response = {"total": 20, "items": items}
-        size = len(json.dumps(response).encode("utf-8"))
-        assert size < 5120, f"Response is {size} bytes, exceeds 5KB"
+        assert _SEARCH20_SIZE < 5120, f"Response is {_SEARCH20_SIZE} bytes, exceeds 5KB"
 
     def test_library_stats_under_200_bytes(self):
-        response = {
-            "songs": 12345,
-            "albums": 890,
-            "artists": 456,
-            "movies": 678,
-            "series": 123,
-            "episodes": 2345,
-        }
-        size = len(json.dumps(response).encode("utf-8"))
-        assert size < 200, f"Stats response is {size} bytes, exceeds 200"
+        assert _STATS_SIZE < 200, f"Stats response is {_STATS_SIZE} bytes, exceeds 200"